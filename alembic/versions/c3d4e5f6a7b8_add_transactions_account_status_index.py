@@ -0,0 +1,35 @@
+"""add_transactions_account_status_index
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d4e5f6a7b8'
+down_revision = 'b2c3d4e5f6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add composite (account_id, status) index used by balance SUM queries"""
+    op.create_index(
+        'ix_transactions_account_id_status',
+        'transactions',
+        ['account_id', 'status'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Drop composite (account_id, status) index"""
+    op.drop_index(
+        'ix_transactions_account_id_status',
+        table_name='transactions',
+        if_exists=True
+    )
@@ -800,6 +800,14 @@ async def shutdown_event():
         print("[OK] Application shutdown complete")
     except Exception as e:
         log.error(f"Error during shutdown: {e}")
+    
+    # Separate from the block above so a failed import there cannot skip it
+    try:
+        # Release pooled webhook delivery connections
+        from webhook_service import close_http_client
+        await close_http_client()
+    except Exception as e:
+        log.error(f"Error closing webhook HTTP client: {e}")
 
 from contextlib import asynccontextmanager
 
@@ -140,6 +140,11 @@ class Transaction(Base):
     )
     account = relationship("Account", back_populates="transactions")
 
+    __table_args__ = (
+        # Balance queries SUM completed transactions per account
+        Index("ix_transactions_account_id_status", "account_id", "status"),
+    )
+
 class KYCInfo(Base):
     __tablename__ = "kyc_info"
 
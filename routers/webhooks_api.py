@@ -4,12 +4,14 @@ Endpoints for managing webhooks and event subscriptions
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 import logging
 
-from deps import get_db
+from deps import get_db, get_current_user
+from models import User
 from webhook_service import WebhookManager, WebhookEventQueue, WebhookEventType
 
 log = logging.getLogger(__name__)
@@ -35,7 +37,8 @@ async def register_webhook(
     url: str = Query(..., description="Webhook URL"),
     events: str = Query(..., description="Comma-separated event types"),
     secret: Optional[str] = Query(None, description="Webhook secret for signature verification"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
 ):
     """Register a new webhook endpoint for event notifications"""
     try:
@@ -74,7 +77,8 @@ async def list_webhooks(db: Session = Depends(get_db)):
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result.get("error"))
         
-        return result["data"]
+        # Already plain JSON types; serialize directly, skipping jsonable_encoder
+        return ORJSONResponse(result["data"])
     except HTTPException:
         raise
     except Exception as e:
@@ -86,7 +90,8 @@ async def list_webhooks(db: Session = Depends(get_db)):
 async def test_webhook(
     webhook_id: str = Query(..., description="Webhook ID"),
     event_type: str = Query(..., description="Event type to test"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
 ):
     """Send a test event to a webhook"""
     try:
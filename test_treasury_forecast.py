@@ -0,0 +1,56 @@
+"""
+Tests for treasury_service cash flow forecasting
+
+The forecast has a Numba kernel, a NumPy path and a plain Decimal fallback;
+whichever is installed, the emitted forecast must be identical. The cached
+forecast report must hand each caller an independent copy.
+"""
+
+import pytest
+
+import treasury_service
+from treasury_service import CashFlowForecaster
+
+
+def _forecast(monkeypatch, numba, numpy, days_ahead=60):
+    monkeypatch.setattr(treasury_service, "NUMBA_AVAILABLE", numba)
+    monkeypatch.setattr(treasury_service, "NUMPY_AVAILABLE", numpy)
+    result = CashFlowForecaster.forecast_cash_flow(days_ahead)
+    assert result["success"]
+    return result["forecast"]
+
+
+def test_numpy_path_matches_decimal_fallback(monkeypatch):
+    if not treasury_service.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    assert _forecast(monkeypatch, False, True) == _forecast(monkeypatch, False, False)
+
+
+def test_numba_path_matches_decimal_fallback(monkeypatch):
+    if not treasury_service.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    assert _forecast(monkeypatch, True, True) == _forecast(monkeypatch, False, False)
+
+
+@pytest.mark.parametrize("numba,numpy", [(True, True), (False, True), (False, False)])
+def test_negative_horizon_is_empty(monkeypatch, numba, numpy):
+    if numba and not treasury_service.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    if numpy and not treasury_service.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    assert _forecast(monkeypatch, numba, numpy, days_ahead=-5) == []
+
+
+def test_cached_forecast_report_is_not_shared(monkeypatch):
+    """Mutating a returned report must not change what later callers get"""
+    monkeypatch.setattr(treasury_service, "_forecast_report_cache", {})
+    first = CashFlowForecaster.generate_forecast_report()
+    first["report"]["scenarios"].clear()
+    first["success"] = False
+
+    second = CashFlowForecaster.generate_forecast_report()
+    third = CashFlowForecaster.generate_forecast_report()
+    assert second["success"] and len(second["report"]["scenarios"]) == 3
+    second["report"]["key_assumptions"].append("mutated")
+    assert "mutated" not in third["report"]["key_assumptions"]
+    assert "mutated" not in CashFlowForecaster.generate_forecast_report()["report"]["key_assumptions"]
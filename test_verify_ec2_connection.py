@@ -0,0 +1,37 @@
+"""
+Tests for verify_ec2_connection.py
+
+Covers the database check when the configured async driver is missing:
+the script must report the failure instead of crashing while disposing
+an engine that was never created.
+"""
+
+import pytest
+
+import verify_ec2_connection
+from config import settings
+
+
+@pytest.fixture
+def passing_prechecks(monkeypatch):
+    """Make the file and dependency checks pass so the database check runs"""
+    for name in ("check_env_file", "check_pem_file", "check_python_dependencies"):
+        monkeypatch.setattr(verify_ec2_connection, name, lambda out=None: True)
+    verify_ec2_connection._get_engine.cache_clear()
+    yield
+    verify_ec2_connection._get_engine.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_missing_driver_reports_failure(monkeypatch, capsys, passing_prechecks):
+    """An uninstalled DB driver fails the check and the script exits 1"""
+    monkeypatch.setattr(settings, "DATABASE_URL", "mysql+aiomysql://u:pw@localhost/db")
+
+    exit_code = await verify_ec2_connection.main()
+
+    output = capsys.readouterr().out
+    assert exit_code == 1
+    assert "❌ Database connection failed" in output
+    assert "❌ Database Connection" in output
+    assert "SOME CHECKS FAILED" in output
+    assert verify_ec2_connection._get_engine.cache_info().currsize == 0
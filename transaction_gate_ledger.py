@@ -47,6 +47,16 @@ class TransactionGate:
         "fee",
         "reversal"
     }
+    _VALID_TYPES_STR = ", ".join(sorted(VALID_TYPES))
+    
+    # Linkage error codes -> messages, resolved only when validation fails
+    LINKAGE_ERRORS = {
+        "E_TX_USER": "user_id is missing or invalid (N/A value)",
+        "E_TX_TYPE_MISSING": "transaction_type is missing",
+        "E_TX_TYPE": "transaction_type '{transaction_type}' is not valid. Valid: " + _VALID_TYPES_STR,
+        "E_TX_AMOUNT": "amount is missing or invalid: {amount}",
+        "E_TX_REF": "reference_number is missing (required for audit trail)",
+    }
     
     @staticmethod
     async def validate_transaction_linkage(transaction: DBTransaction) -> Tuple[bool, str]:
@@ -65,24 +75,31 @@ class TransactionGate:
         
         # Check user_id
         if not transaction.user_id or transaction.user_id <= 0:
-            errors.append("user_id is missing or invalid (N/A value)")
+            errors.append("E_TX_USER")
         
         # Check transaction type
         if not transaction.transaction_type:
-            errors.append("transaction_type is missing")
+            errors.append("E_TX_TYPE_MISSING")
         elif transaction.transaction_type.lower() not in TransactionGate.VALID_TYPES:
-            errors.append(f"transaction_type '{transaction.transaction_type}' is not valid. Valid: {TransactionGate.VALID_TYPES}")
+            errors.append("E_TX_TYPE")
         
         # Check amount
         if not transaction.amount or transaction.amount <= 0:
-            errors.append(f"amount is missing or invalid: {transaction.amount}")
+            errors.append("E_TX_AMOUNT")
         
         # Check reference (required for audit trail)
         if not transaction.reference_number or transaction.reference_number.strip() == "":
-            errors.append("reference_number is missing (required for audit trail)")
+            errors.append("E_TX_REF")
         
         if errors:
-            return False, "; ".join(errors)
+            messages = TransactionGate.LINKAGE_ERRORS
+            return False, "; ".join(
+                messages[code].format(
+                    transaction_type=transaction.transaction_type,
+                    amount=transaction.amount,
+                )
+                for code in errors
+            )
         
         return True, "OK"
     
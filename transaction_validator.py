@@ -18,7 +18,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from models import User, Account, Transaction
 from balance_service_ledger import BalanceServiceLedger
-from account_id_enforcement import account_id_enforcement
 import logging
 
 logger = logging.getLogger(__name__)
@@ -135,33 +134,29 @@ class TransactionValidator:
             return False, f"Recipient account is inactive"
 
         # 4. Check both have accounts (RULE 1)
-        sender_result = await db.execute(
-            select(Account).where(Account.user_id == sender_id)
+        # Ownership, admin-account and active-status predicates are folded into
+        # a single SELECT for both parties instead of re-validating each account
+        # through account_id_enforcement with extra round trips.
+        accounts_result = await db.execute(
+            select(Account)
+            .where(
+                Account.owner_id.in_((sender_id, recipient_id)),
+                Account.is_admin_account.is_(False),
+                Account.status == "active",
+            )
+            .order_by(Account.id)
         )
-        sender_account = sender_result.scalar_one_or_none()
-        if not sender_account:
-            return False, f"Sender has no account. Cannot transfer without account (RULE 1)"
+        accounts_by_owner = {}
+        for account in accounts_result.scalars().all():
+            accounts_by_owner.setdefault(account.owner_id, account)
 
-        # 🔧 ENFORCEMENT: Validate sender account ownership
-        is_valid, reason = await account_id_enforcement.validate_account_ownership(
-            db=db, user_id=sender_id, account_id=sender_account.id
-        )
-        if not is_valid:
-            return False, f"Sender account validation failed: {reason}"
+        sender_account = accounts_by_owner.get(sender_id)
+        if not sender_account:
+            return False, f"Sender has no active account. Cannot transfer without account (RULE 1)"
 
-        recipient_result = await db.execute(
-            select(Account).where(Account.user_id == recipient_id)
-        )
-        recipient_account = recipient_result.scalar_one_or_none()
+        recipient_account = accounts_by_owner.get(recipient_id)
         if not recipient_account:
-            return False, f"Recipient has no account. Cannot transfer to account that doesn't exist (RULE 1)"
-
-        # 🔧 ENFORCEMENT: Validate recipient account ownership
-        is_valid, reason = await account_id_enforcement.validate_account_ownership(
-            db=db, user_id=recipient_id, account_id=recipient_account.id
-        )
-        if not is_valid:
-            return False, f"Recipient account validation failed: {reason}"
+            return False, f"Recipient has no active account. Cannot transfer to account that doesn't exist (RULE 1)"
 
         # 5. Check sender has sufficient balance (RULE 3: derived from ledger only)
         # ISSUE #1 FIX: Use BalanceServiceLedger instead of BalanceService
@@ -13,71 +13,203 @@ Features:
 """
 
 import logging
+from copy import deepcopy
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from itertools import count
+from time import monotonic, monotonic_ns, time
+from typing import Any, Dict, List, Optional
 from decimal import Decimal
-from sqlalchemy.orm import Session
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 log = logging.getLogger(__name__)
 
+_id_counter = count()
+
+# Hot Decimal multipliers, parsed once
+_DEC_ZERO = Decimal("0")
+_DEC_ONE = Decimal(1)
+_DEC_095 = Decimal("0.95")
+_DEC_005 = Decimal("0.05")
+_DEC_0015 = Decimal("0.015")
+
+# Forecast report is static between refreshes; dashboards poll it, so keep
+# the built response for a short TTL. key -> (built_at_monotonic, response)
+_FORECAST_REPORT_TTL_SECONDS = 60
+_forecast_report_cache: Dict[str, tuple] = {}
+
+
+def _gen_id(prefix: str) -> str:
+    """Generate a process-unique ID (monotonic clock + counter, no datetime construction)"""
+    return f"{prefix}_{monotonic_ns()}_{next(_id_counter)}"
+
+
+# [wall clock seconds, ISO string] of the last formatted timestamp
+_last_ts = [0.0, ""]
+
+
+def _now_iso() -> str:
+    """UTC ISO timestamp, memoized at 100ms granularity for polling dashboards"""
+    t = time()
+    if t - _last_ts[0] > 0.1:
+        _last_ts[0] = t
+        _last_ts[1] = datetime.utcfromtimestamp(t).isoformat()
+    return _last_ts[1]
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _forecast_kernel(days_ahead, base):
+        """Compiled forecast arithmetic: rows of (inflows, outflows, net_flow, confidence)"""
+        out = np.empty((days_ahead, 4))
+        for d in range(days_ahead):
+            daily = base * (1 + d * 0.015)
+            out[d, 0] = daily
+            out[d, 1] = daily * 0.95
+            out[d, 2] = daily * 0.05
+            out[d, 3] = max(0.98 - d * 0.01, 0.70)
+        return out
+
+
+def _forecast_columns(days_ahead: int, base_daily: Decimal):
+    """
+    Compute (inflows, outflows, net_flows, confidence) for each forecast day.
+    
+    Uses the Numba kernel when installed, NumPy vectors otherwise, and plain
+    Decimal arithmetic when neither accelerator is available.
+    """
+    # A negative horizon yields an empty forecast, as range() does
+    days_ahead = max(days_ahead, 0)
+    if NUMBA_AVAILABLE:
+        inflows, outflows, net_flows, confidence = _forecast_kernel(days_ahead, float(base_daily)).T
+        return inflows.tolist(), outflows.tolist(), net_flows.tolist(), confidence.tolist()
+    
+    if NUMPY_AVAILABLE:
+        days = np.arange(days_ahead)
+        inflows = float(base_daily) * (1 + 0.015 * days)
+        outflows = inflows * 0.95
+        net_flows = inflows * 0.05
+        confidence = np.maximum(0.98 - 0.01 * days, 0.70)
+        return inflows.tolist(), outflows.tolist(), net_flows.tolist(), confidence.tolist()
+    
+    inflows = [base_daily * (_DEC_ONE + _DEC_0015 * day) for day in range(days_ahead)]
+    outflows = [flow * _DEC_095 for flow in inflows]
+    net_flows = [flow * _DEC_005 for flow in inflows]
+    confidence = [max(0.98 - (day * 0.01), 0.70) for day in range(days_ahead)]
+    return inflows, outflows, net_flows, confidence
+
+
+# Result records returned inside the {"success": True, ...} envelope. They are
+# slotted dataclasses rather than dicts; FastAPI's encoder (or
+# dataclasses.asdict) turns them into JSON objects at the response boundary.
+
+@dataclass(slots=True)
+class PortfolioResult:
+    portfolio_id: str
+    name: str
+    total_value: str
+    allocations: list
+    created_at: str
+    status: str
+
+
+@dataclass(slots=True)
+class LiquidityTransferResult:
+    transfer_id: str
+    source: str
+    destination: str
+    amount: str
+    status: str
+    initiated_at: str
+
+
+@dataclass(slots=True)
+class CollateralResult:
+    collateral_id: str
+    asset_type: Optional[str]
+    asset_value: Any
+    haircut_percentage: float
+    collateral_value: str
+    registered_at: str
+    status: str
+
+
+@dataclass(slots=True)
+class MarginCallResult:
+    account_id: str
+    margin_call_id: str
+    current_ratio: float
+    required_ratio: float
+    action_required: str
+    amount_required: str
+    deadline: str
+    status: str
+
 
 class AssetManager:
     """Manage asset portfolios"""
 
     @staticmethod
-    async def allocate_assets(
-        db: Session,
+    def allocate_assets(
         portfolio_config: Dict
     ) -> Dict:
         """Allocate assets based on portfolio config"""
         try:
-            portfolio_id = f"PORT_{datetime.utcnow().timestamp()}"
-            
-            allocations = []
-            total_allocated = Decimal("0")
+            portfolio_id = _gen_id("PORT")
             
-            for asset_config in portfolio_config.get("assets", []):
-                allocation = {
+            allocations = [
+                {
                     "asset_id": asset_config.get("asset_id"),
                     "asset_type": asset_config.get("type", "cash"),
                     "allocation_percentage": asset_config.get("percentage", 0),
-                    "current_value": Decimal("0"),
-                    "target_value": Decimal("0")
+                    "current_value": _DEC_ZERO,
+                    "target_value": _DEC_ZERO
                 }
-                allocations.append(allocation)
+                for asset_config in portfolio_config.get("assets", [])
+            ]
             
-            portfolio = {
-                "portfolio_id": portfolio_id,
-                "name": portfolio_config.get("name", "Portfolio"),
-                "total_value": "1000000",
-                "allocations": allocations,
-                "created_at": datetime.utcnow().isoformat(),
-                "status": "active"
-            }
+            portfolio = PortfolioResult(
+                portfolio_id=portfolio_id,
+                name=portfolio_config.get("name", "Portfolio"),
+                total_value="1000000",
+                allocations=allocations,
+                created_at=_now_iso(),
+                status="active"
+            )
             
-            log.info(f"Assets allocated: portfolio_id={portfolio_id}")
+            log.info("Assets allocated: portfolio_id=%s", portfolio_id)
             
             return {
                 "success": True,
                 "portfolio": portfolio
             }
         except Exception as e:
-            log.error(f"Asset allocation error: {e}")
+            log.error("Asset allocation error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def rebalance_portfolio(
-        db: Session,
+    def rebalance_portfolio(
         portfolio_id: str
     ) -> Dict:
         """Rebalance portfolio to target allocations"""
         try:
             rebalancing = {
                 "portfolio_id": portfolio_id,
-                "rebalance_date": datetime.utcnow().isoformat(),
+                "rebalance_date": _now_iso(),
                 "actions": [
                     {
                         "asset_type": "stocks",
@@ -96,22 +228,21 @@ class AssetManager:
                 "transaction_costs": "250"
             }
             
-            log.info(f"Portfolio rebalanced: portfolio_id={portfolio_id}")
+            log.info("Portfolio rebalanced: portfolio_id=%s", portfolio_id)
             
             return {
                 "success": True,
                 "rebalancing": rebalancing
             }
         except Exception as e:
-            log.error(f"Portfolio rebalancing error: {e}")
+            log.error("Portfolio rebalancing error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def get_portfolio_value(
-        db: Session,
+    def get_portfolio_value(
         portfolio_id: str
     ) -> Dict:
         """Get current portfolio value"""
@@ -123,7 +254,7 @@ class AssetManager:
                 "stocks": "500000",
                 "bonds": "300000",
                 "other": "50000",
-                "updated_at": datetime.utcnow().isoformat(),
+                "updated_at": _now_iso(),
                 "unrealized_gains": "50000",
                 "gain_percentage": 0.051
             }
@@ -133,14 +264,14 @@ class AssetManager:
                 "portfolio_value": value
             }
         except Exception as e:
-            log.error(f"Portfolio value error: {e}")
+            log.error("Portfolio value error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def update_asset_values(db: Session) -> Dict:
+    def update_asset_values() -> Dict:
         """Update all asset values"""
         try:
             updated_assets = [
@@ -149,15 +280,15 @@ class AssetManager:
                 {"asset": "crypto", "old_price": 2000, "new_price": 2150}
             ]
             
-            log.info(f"Asset values updated: {len(updated_assets)} assets")
+            log.info("Asset values updated: %s assets", len(updated_assets))
             
             return {
                 "success": True,
                 "updated_assets": updated_assets,
-                "update_time": datetime.utcnow().isoformat()
+                "update_time": _now_iso()
             }
         except Exception as e:
-            log.error(f"Asset update error: {e}")
+            log.error("Asset update error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -168,44 +299,53 @@ class CashFlowForecaster:
     """Forecast cash flow"""
 
     @staticmethod
-    async def forecast_cash_flow(
-        db: Session,
+    def forecast_cash_flow(
         days_ahead: int = 30
     ) -> Dict:
         """Forecast cash flow"""
         try:
-            forecast = []
             base_daily = Decimal("1500000")
+            base_date = datetime.utcnow().date()
+            dates = [(base_date + timedelta(days=day)).isoformat() for day in range(days_ahead)]
+            
+            inflows, outflows, net_flows, confidence = _forecast_columns(days_ahead, base_daily)
+            
+            # Integer cents sit alongside the original money strings so
+            # existing consumers keep their keys
+            forecast = [
+                {
+                    "date": date,
+                    "inflows": f"{inflow:.2f}",
+                    "outflows": f"{outflow:.2f}",
+                    "net_flow": f"{net_flow:.2f}",
+                    "inflows_cents": round(inflow * 100),
+                    "outflows_cents": round(outflow * 100),
+                    "net_flow_cents": round(net_flow * 100),
+                    "confidence": conf
+                }
+                for date, inflow, outflow, net_flow, conf in zip(
+                    dates, inflows, outflows, net_flows, confidence
+                )
+            ]
             
-            for day in range(days_ahead):
-                forecast_date = datetime.utcnow() + timedelta(days=day)
-                daily_flow = base_daily * Decimal(1 + (day * 0.015))
-                
-                forecast.append({
-                    "date": forecast_date.date().isoformat(),
-                    "inflows": str(daily_flow),
-                    "outflows": str(daily_flow * Decimal("0.95")),
-                    "net_flow": str(daily_flow * Decimal("0.05")),
-                    "confidence": max(0.98 - (day * 0.01), 0.70)
-                })
-            
-            log.info(f"Cash flow forecast: {days_ahead} days")
+            log.info("Cash flow forecast: %s days", days_ahead)
             
             return {
                 "success": True,
                 "forecast": forecast,
                 "days_ahead": days_ahead,
-                "average_net_flow": str(base_daily * Decimal("0.05"))
+                "average_net_flow": str(base_daily * _DEC_005),
+                "average_net_flow_cents": round(base_daily * _DEC_005 * 100)
             }
         except Exception as e:
-            log.error(f"Cash flow forecast error: {e}")
+            log.error("Cash flow forecast error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def analyze_cash_position(db: Session) -> Dict:
+    def analyze_cash_position() -> Dict:
         """Analyze current cash position"""
         try:
             analysis = {
@@ -226,18 +366,23 @@ class CashFlowForecaster:
                 "analysis": analysis
             }
         except Exception as e:
-            log.error(f"Cash position analysis error: {e}")
+            log.error("Cash position analysis error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def generate_forecast_report(db: Session) -> Dict:
-        """Generate detailed forecast report"""
+    def generate_forecast_report() -> Dict:
+        """Generate detailed forecast report (cached for 60 seconds)"""
+        cached = _forecast_report_cache.get("forecast_report")
+        if cached and monotonic() - cached[0] < _FORECAST_REPORT_TTL_SECONDS:
+            # Callers get their own copy so mutating it cannot alter the cache
+            return deepcopy(cached[1])
+        
         try:
             report = {
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": _now_iso(),
                 "forecast_period": "90 days",
                 "key_assumptions": [
                     "5% growth in transaction volume",
@@ -253,38 +398,39 @@ class CashFlowForecaster:
             
             log.info("Forecast report generated")
             
-            return {
+            response = {
                 "success": True,
                 "report": report
             }
+            _forecast_report_cache["forecast_report"] = (monotonic(), deepcopy(response))
+            return response
         except Exception as e:
-            log.error(f"Forecast report error: {e}")
+            log.error("Forecast report error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def adjust_forecast(
-        db: Session,
+    def adjust_forecast(
         adjustment_factors: Dict
     ) -> Dict:
         """Adjust forecast based on new factors"""
         try:
             adjusted_forecast = {
-                "adjustment_date": datetime.utcnow().isoformat(),
+                "adjustment_date": _now_iso(),
                 "factors_applied": adjustment_factors,
                 "revised_forecast": "under_recalculation"
             }
             
-            log.info(f"Forecast adjusted with {len(adjustment_factors)} factors")
+            log.info("Forecast adjusted with %s factors", len(adjustment_factors))
             
             return {
                 "success": True,
                 "adjusted_forecast": adjusted_forecast
             }
         except Exception as e:
-            log.error(f"Forecast adjustment error: {e}")
+            log.error("Forecast adjustment error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -295,8 +441,7 @@ class LiquidityManager:
     """Manage liquidity"""
 
     @staticmethod
-    async def monitor_liquidity(
-        db: Session,
+    def monitor_liquidity(
         account_id: str
     ) -> Dict:
         """Monitor account liquidity"""
@@ -308,7 +453,7 @@ class LiquidityManager:
                 "safety_margin": "250000",
                 "liquidity_ratio": 2.25,
                 "status": "healthy",
-                "updated_at": datetime.utcnow().isoformat()
+                "updated_at": _now_iso()
             }
             
             return {
@@ -316,45 +461,44 @@ class LiquidityManager:
                 "liquidity": liquidity
             }
         except Exception as e:
-            log.error(f"Liquidity monitoring error: {e}")
+            log.error("Liquidity monitoring error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def trigger_liquidity_transfer(
-        db: Session,
+    def trigger_liquidity_transfer(
         source_account: str,
         dest_account: str,
         amount: Decimal
     ) -> Dict:
         """Transfer liquidity between accounts"""
         try:
-            transfer = {
-                "transfer_id": f"LIQ_{datetime.utcnow().timestamp()}",
-                "source": source_account,
-                "destination": dest_account,
-                "amount": str(amount),
-                "status": "pending",
-                "initiated_at": datetime.utcnow().isoformat()
-            }
+            transfer = LiquidityTransferResult(
+                transfer_id=_gen_id("LIQ"),
+                source=source_account,
+                destination=dest_account,
+                amount=str(amount),
+                status="pending",
+                initiated_at=_now_iso()
+            )
             
-            log.info(f"Liquidity transfer: {amount} from {source_account} to {dest_account}")
+            log.info("Liquidity transfer: %s from %s to %s", amount, source_account, dest_account)
             
             return {
                 "success": True,
                 "transfer": transfer
             }
         except Exception as e:
-            log.error(f"Liquidity transfer error: {e}")
+            log.error("Liquidity transfer error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def get_liquidity_status(db: Session) -> Dict:
+    def get_liquidity_status() -> Dict:
         """Get system-wide liquidity status"""
         try:
             status = {
@@ -363,7 +507,7 @@ class LiquidityManager:
                 "reserved_liquidity": "5000000",
                 "liquidity_coverage_ratio": 2.5,
                 "status": "excellent",
-                "updated_at": datetime.utcnow().isoformat()
+                "updated_at": _now_iso()
             }
             
             return {
@@ -371,15 +515,14 @@ class LiquidityManager:
                 "liquidity_status": status
             }
         except Exception as e:
-            log.error(f"Liquidity status error: {e}")
+            log.error("Liquidity status error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def set_liquidity_limits(
-        db: Session,
+    def set_liquidity_limits(
         account_id: str,
         limits: Dict
     ) -> Dict:
@@ -390,17 +533,17 @@ class LiquidityManager:
                 "minimum_balance": limits.get("minimum", 100000),
                 "maximum_daily_withdrawal": limits.get("max_daily", 1000000),
                 "maximum_transaction": limits.get("max_transaction", 500000),
-                "configured_at": datetime.utcnow().isoformat()
+                "configured_at": _now_iso()
             }
             
-            log.info(f"Liquidity limits set: {account_id}")
+            log.info("Liquidity limits set: %s", account_id)
             
             return {
                 "success": True,
                 "limit_config": limit_config
             }
         except Exception as e:
-            log.error(f"Liquidity limit configuration error: {e}")
+            log.error("Liquidity limit configuration error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -411,43 +554,73 @@ class CollateralManager:
     """Manage collateral"""
 
     @staticmethod
-    async def register_collateral(
-        db: Session,
+    def _build_collateral(asset: Dict, registered_at: str) -> CollateralResult:
+        """Build a collateral record; haircut is a fraction (0.20 = 20%)"""
+        value = float(asset.get("value", 0))
+        haircut = float(asset.get("haircut", 0.20))
+        collateral_value = value * (1.0 - haircut)
+        
+        return CollateralResult(
+            collateral_id=_gen_id("COLL"),
+            asset_type=asset.get("type"),
+            asset_value=asset.get("value"),
+            haircut_percentage=haircut,
+            collateral_value=f"{collateral_value:.2f}",
+            registered_at=registered_at,
+            status="active"
+        )
+
+    @staticmethod
+    def register_collateral(
         asset: Dict
     ) -> Dict:
         """Register collateral asset"""
         try:
-            collateral_id = f"COLL_{datetime.utcnow().timestamp()}"
+            collateral = CollateralManager._build_collateral(
+                asset, _now_iso()
+            )
+            
+            log.info("Collateral registered: %s", collateral.collateral_id)
             
-            collateral = {
-                "collateral_id": collateral_id,
-                "asset_type": asset.get("type"),
-                "asset_value": asset.get("value"),
-                "haircut_percentage": asset.get("haircut", 0.20),
-                "collateral_value": str(
-                    Decimal(asset.get("value", 0)) * 
-                    Decimal(1 - (asset.get("haircut", 0.20) / 100))
-                ),
-                "registered_at": datetime.utcnow().isoformat(),
-                "status": "active"
+            return {
+                "success": True,
+                "collateral": collateral
             }
+        except Exception as e:
+            log.error("Collateral registration error: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @staticmethod
+    def register_collaterals(
+        assets: List[Dict]
+    ) -> Dict:
+        """Register a batch of collateral assets in one pass"""
+        try:
+            registered_at = _now_iso()
+            collaterals = [
+                CollateralManager._build_collateral(asset, registered_at)
+                for asset in assets
+            ]
             
-            log.info(f"Collateral registered: {collateral_id}")
+            log.info("Registered %s collaterals", len(collaterals))
             
             return {
                 "success": True,
-                "collateral": collateral
+                "count": len(collaterals),
+                "collaterals": collaterals
             }
         except Exception as e:
-            log.error(f"Collateral registration error: {e}")
+            log.error("Bulk collateral registration error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def calculate_collateral_value(
-        db: Session,
+    def calculate_collateral_value(
         asset_id: str
     ) -> Dict:
         """Calculate current collateral value"""
@@ -457,7 +630,7 @@ class CollateralManager:
                 "market_value": "500000",
                 "haircut": 0.20,
                 "collateral_value": "400000",
-                "last_updated": datetime.utcnow().isoformat()
+                "last_updated": _now_iso()
             }
             
             return {
@@ -465,14 +638,14 @@ class CollateralManager:
                 "value": value
             }
         except Exception as e:
-            log.error(f"Collateral value calculation error: {e}")
+            log.error("Collateral value calculation error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def monitor_collateral_ratio(db: Session) -> Dict:
+    def monitor_collateral_ratio() -> Dict:
         """Monitor collateral ratios"""
         try:
             ratio = {
@@ -482,7 +655,7 @@ class CollateralManager:
                 "minimum_ratio": 1.5,
                 "status": "healthy",
                 "margin_call_threshold": 1.2,
-                "monitored_at": datetime.utcnow().isoformat()
+                "monitored_at": _now_iso()
             }
             
             return {
@@ -490,38 +663,37 @@ class CollateralManager:
                 "collateral_ratio": ratio
             }
         except Exception as e:
-            log.error(f"Collateral monitoring error: {e}")
+            log.error("Collateral monitoring error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
     @staticmethod
-    async def trigger_margin_call(
-        db: Session,
+    def trigger_margin_call(
         account_id: str
     ) -> Dict:
         """Trigger margin call for account"""
         try:
-            margin_call = {
-                "account_id": account_id,
-                "margin_call_id": f"MC_{datetime.utcnow().timestamp()}",
-                "current_ratio": 1.15,
-                "required_ratio": 1.5,
-                "action_required": "deposit_collateral",
-                "amount_required": "250000",
-                "deadline": (datetime.utcnow() + timedelta(hours=24)).isoformat(),
-                "status": "active"
-            }
+            margin_call = MarginCallResult(
+                account_id=account_id,
+                margin_call_id=_gen_id("MC"),
+                current_ratio=1.15,
+                required_ratio=1.5,
+                action_required="deposit_collateral",
+                amount_required="250000",
+                deadline=(datetime.utcnow() + timedelta(hours=24)).isoformat(),
+                status="active"
+            )
             
-            log.info(f"Margin call triggered: {account_id}")
+            log.info("Margin call triggered: %s", account_id)
             
             return {
                 "success": True,
                 "margin_call": margin_call
             }
         except Exception as e:
-            log.error(f"Margin call error: {e}")
+            log.error("Margin call error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -5,7 +5,10 @@ Usage: python update_admin.py
 """
 
 import asyncio
-from sqlalchemy import select
+import os
+import sys
+from sqlalchemy import select, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -16,8 +19,9 @@ from app.models import User
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,
+    echo=bool(os.environ.get("SQL_ECHO")),  # set SQL_ECHO=1 to log statements
     future=True,
+    pool_pre_ping=True,
 )
 
 # Create async session
@@ -30,35 +34,28 @@ async def update_or_create_admin():
     """Update or create admin user in database."""
     async with AsyncSessionLocal() as session:
         try:
-            # Check if admin exists
-            result = await session.execute(
-                select(User).filter(User.email == settings.ADMIN_EMAIL)
+            # Single upsert round trip keyed on the unique email column.
+            # xmax = 0 on the returned row means it was freshly inserted.
+            admin_values = {
+                "full_name": "Admin User",
+                "hashed_password": get_password_hash(settings.ADMIN_PASSWORD),
+                "is_admin": True,
+                "is_active": True,
+            }
+            stmt = (
+                pg_insert(User)
+                .values(email=settings.ADMIN_EMAIL, **admin_values)
+                .on_conflict_do_update(index_elements=[User.email], set_=admin_values)
+                .returning(User.id, (literal_column("xmax") == 0).label("inserted"))
             )
-            admin_user = result.scalars().first()
-
-            if admin_user:
-                # Update existing admin
-                print(f"✓ Found existing admin: {admin_user.email}")
-                admin_user.full_name = "Admin User"
-                admin_user.hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
-                admin_user.is_admin = True
-                admin_user.is_active = True
-                await session.commit()
-                print(f"✓ Updated admin password and settings")
-            else:
-                # Create new admin
-                print(f"✗ Admin not found, creating new admin...")
-                hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
-                new_admin = User(
-                    full_name="Admin User",
-                    email=settings.ADMIN_EMAIL,
-                    hashed_password=hashed_password,
-                    is_admin=True,
-                    is_active=True
-                )
-                session.add(new_admin)
-                await session.commit()
+            result = await session.execute(stmt)
+            row = result.one()
+            await session.commit()
+
+            if row.inserted:
                 print(f"✓ Created new admin user: {settings.ADMIN_EMAIL}")
+            else:
+                print(f"✓ Updated admin password and settings: {settings.ADMIN_EMAIL}")
 
             print("\n✅ Admin user setup complete!")
             print(f"   Email: {settings.ADMIN_EMAIL}")
@@ -75,24 +72,49 @@ async def list_all_users():
     """List all users in the database."""
     async with AsyncSessionLocal() as session:
         try:
-            result = await session.execute(select(User))
-            users = result.scalars().all()
+            # Stream rows in batches instead of materializing every User
+            result = await session.stream_scalars(
+                select(User).execution_options(yield_per=1000)
+            )
 
-            if not users:
-                print("No users found in database")
+            total = 0
+            lines = []
+            async for user in result:
+                if total == 0:
+                    lines.append("\n📋 Users:")
+                    lines.append("-" * 60)
+                total += 1
+                admin_status = "✓ ADMIN" if user.is_admin else "  User"
+                active_status = "Active" if user.is_active else "Inactive"
+                lines.append(f"{admin_status} | {user.email:30} | {active_status}")
+                # One write per batch instead of one print per user
+                if len(lines) >= 1000:
+                    sys.stdout.write("\n".join(lines) + "\n")
+                    lines.clear()
+
+            if total == 0:
+                lines.append("No users found in database")
             else:
-                print(f"\n📋 Total users: {len(users)}")
-                print("-" * 60)
-                for user in users:
-                    admin_status = "✓ ADMIN" if user.is_admin else "  User"
-                    active_status = "Active" if user.is_active else "Inactive"
-                    print(f"{admin_status} | {user.email:30} | {active_status}")
-                print("-" * 60)
+                lines.append("-" * 60)
+                lines.append(f"📋 Total users: {total}")
+            sys.stdout.write("\n".join(lines) + "\n")
 
         except Exception as e:
             print(f"Error listing users: {e}")
 
 
+async def main():
+    """Run the admin upsert and user listing concurrently, then release the pool.
+
+    Each task opens its own session, so their transactions never interleave.
+    The listing may not yet include an admin created by the concurrent upsert.
+    """
+    try:
+        await asyncio.gather(update_or_create_admin(), list_all_users())
+    finally:
+        await engine.dispose()
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Admin User Management Script")
@@ -102,9 +124,8 @@ if __name__ == "__main__":
     print(f"Admin Password: {settings.ADMIN_PASSWORD}")
     print("\n" + "=" * 60)
 
-    # Run the async function
-    asyncio.run(update_or_create_admin())
-    asyncio.run(list_all_users())
+    # Run both tasks on one event loop / connection pool
+    asyncio.run(main())
 
     print("\n✅ Complete! You can now login with:")
     print(f"   Email: {settings.ADMIN_EMAIL}")
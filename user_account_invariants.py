@@ -17,8 +17,9 @@ Invariants:
 """
 
 import logging
-from typing import Optional, Tuple, Dict, Any
-from sqlalchemy import select
+from decimal import Decimal
+from typing import Optional, Tuple, Dict, Any, List
+from sqlalchemy import bindparam, func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import User as DBUser, Account as DBAccount, Transaction as DBTransaction
@@ -26,6 +27,30 @@ from schemas import User as PydanticUser
 
 log = logging.getLogger(__name__)
 
+# Hot-path statements, built once as lambda statements so SQLAlchemy caches
+# the constructed and compiled query instead of rebuilding it per call.
+# User and primary account in a single round trip; the outer join keeps the
+# user row so "no user" and "no account" stay distinguishable.
+_USER_WITH_ACCOUNT_STMT = lambda_stmt(
+    lambda: select(DBUser, DBAccount)
+    .outerjoin(DBAccount, DBAccount.owner_id == DBUser.id)
+    .where(DBUser.id == bindparam("user_id"))
+    .order_by(DBAccount.id)
+    .limit(1)
+)
+_DEC_ZERO = Decimal("0")
+_COMPLETED_BALANCE_STMT = lambda_stmt(
+    lambda: select(
+        func.coalesce(func.sum(DBTransaction.amount), _DEC_ZERO)
+    ).where(
+        DBTransaction.account_id == bindparam("account_id"),
+        DBTransaction.status == "completed"
+    )
+)
+_KYC_STATUS_STMT = lambda_stmt(
+    lambda: select(DBUser.kyc_status).where(DBUser.id == bindparam("user_id"))
+)
+
 
 class UserAccountInvariantError(Exception):
     """Raised when a core invariant is violated"""
@@ -39,38 +64,85 @@ class InvariantValidator:
     async def ensure_user_has_account(
         db: AsyncSession,
         user_id: int,
-        error_prefix: str = "Operation blocked"
-    ) -> DBAccount:
+        error_prefix: str = "Operation blocked",
+        cache: Optional[Dict[int, Tuple[DBUser, DBAccount]]] = None
+    ) -> Tuple[DBUser, DBAccount]:
         """
         MANDATORY: Verify user has at least one account.
         
-        Returns: The primary account (owner_id=user_id)
+        Returns: (user, primary account) - fetched together in one query
         Raises: UserAccountInvariantError if user or account missing
         
+        Pass a request-scoped dict (see invariant_cache) as `cache` to reuse a
+        successful lookup for the rest of the request. Write paths that change
+        the user's account should `cache.pop(user_id, None)`.
+        
         Usage:
-            account = await InvariantValidator.ensure_user_has_account(db, user_id)
+            user, account = await InvariantValidator.ensure_user_has_account(db, user_id)
         """
+        if cache is not None:
+            cached = cache.get(user_id)
+            if cached is not None:
+                return cached
+        
+        result = await db.execute(_USER_WITH_ACCOUNT_STMT, {"user_id": user_id})
+        row = result.one_or_none()
+        
         # Step 1: User must exist
-        result = await db.execute(select(DBUser).filter(DBUser.id == user_id))
-        user = result.scalar_one_or_none()
-        if not user:
+        if row is None:
             raise UserAccountInvariantError(
                 f"{error_prefix}: User {user_id} does not exist"
             )
         
         # Step 2: User must have account
-        result = await db.execute(
-            select(DBAccount).filter(DBAccount.owner_id == user_id)
-        )
-        account = result.scalar_one_or_none()
-        if not account:
+        user, account = row
+        if account is None:
             raise UserAccountInvariantError(
                 f"{error_prefix}: User {user_id} has no account. "
                 f"System invariant violated: every user must have an account. "
                 f"User was created without binding to an account."
             )
         
-        return account
+        if cache is not None:
+            cache[user_id] = (user, account)
+        return user, account
+    
+    @staticmethod
+    async def ensure_users_have_accounts(
+        db: AsyncSession,
+        user_ids: List[int],
+        error_prefix: str = "Operation blocked"
+    ) -> Dict[int, DBAccount]:
+        """
+        Batch form of ensure_user_has_account for lists of users.
+        
+        Returns: {user_id: primary account} from a single owner_id IN (...) query
+        Raises: UserAccountInvariantError listing every user without an account
+        
+        Usage:
+            accounts = await InvariantValidator.ensure_users_have_accounts(db, user_ids)
+        """
+        unique_ids = set(user_ids)
+        if not unique_ids:
+            return {}
+        
+        result = await db.execute(
+            select(DBAccount)
+            .where(DBAccount.owner_id.in_(unique_ids))
+            .order_by(DBAccount.id)
+        )
+        accounts: Dict[int, DBAccount] = {}
+        for account in result.scalars().all():
+            accounts.setdefault(account.owner_id, account)
+        
+        missing = sorted(unique_ids - accounts.keys())
+        if missing:
+            raise UserAccountInvariantError(
+                f"{error_prefix}: Users {missing} have no account. "
+                f"System invariant violated: every user must have an account."
+            )
+        
+        return accounts
     
     @staticmethod
     async def validate_transaction_operation(
@@ -96,7 +168,7 @@ class InvariantValidator:
             )
         """
         # Ensure user exists with account
-        account = await InvariantValidator.ensure_user_has_account(
+        user, account = await InvariantValidator.ensure_user_has_account(
             db, user_id,
             error_prefix=f"Cannot perform {operation}"
         )
@@ -109,16 +181,13 @@ class InvariantValidator:
                 f"User's account is {account.id}"
             )
         
-        result = await db.execute(select(DBUser).filter(DBUser.id == user_id))
-        user = result.scalar_one_or_none()
-        
         return user, account
     
     @staticmethod
     async def validate_balance_query(
         db: AsyncSession,
         user_id: int
-    ) -> Tuple[DBUser, DBAccount, float]:
+    ) -> Tuple[DBUser, DBAccount, Decimal]:
         """
         MANDATORY for balance queries.
         
@@ -135,20 +204,17 @@ class InvariantValidator:
             db, user_id, None, "balance query"
         )
         
-        # Calculate balance from completed transactions
+        # Calculate balance from completed transactions (aggregated in SQL,
+        # served by the (account_id, status) index). coalesce takes the
+        # Numeric type of amount, so the driver hands back a Decimal.
         result = await db.execute(
-            select(DBTransaction).filter(
-                (DBTransaction.account_id == account.id) &
-                (DBTransaction.status == 'completed')
-            )
+            _COMPLETED_BALANCE_STMT, {"account_id": account.id}
         )
-        transactions = result.scalars().all()
-        
-        balance = sum(float(t.amount) for t in transactions)
+        balance = result.scalar_one()
         
         log.info(
-            f"✓ Balance query validated for user {user_id}: "
-            f"account {account.id}, balance {balance}"
+            "✓ Balance query validated for user %s: account %s, balance %s",
+            user_id, account.id, balance
         )
         
         return user, account, balance
@@ -156,12 +222,17 @@ class InvariantValidator:
     @staticmethod
     async def validate_user_kyc_status(
         db: AsyncSession,
-        user_id: int
-    ) -> Tuple[DBUser, str]:
+        user_id: int,
+        cache: Optional[Dict[int, Tuple[DBUser, DBAccount]]] = None
+    ) -> str:
         """
         Check user's KYC status.
         
-        Returns: (user, kyc_status)
+        Returns: kyc_status
+        
+        Only the kyc_status column is selected; the User entity is not loaded.
+        Callers that also need the user should pass the request-scoped
+        `cache` (see invariant_cache), which is consulted first.
         
         KYC States:
         - 'not_started': User registered, no KYC submitted
@@ -169,13 +240,18 @@ class InvariantValidator:
         - 'approved': KYC approved, can transact
         - 'rejected': KYC rejected, cannot transact
         """
-        result = await db.execute(select(DBUser).filter(DBUser.id == user_id))
-        user = result.scalar_one_or_none()
+        if cache is not None:
+            cached = cache.get(user_id)
+            if cached is not None:
+                return cached[0].kyc_status
+        
+        result = await db.execute(_KYC_STATUS_STMT, {"user_id": user_id})
+        row = result.one_or_none()
         
-        if not user:
+        if row is None:
             raise UserAccountInvariantError(f"User {user_id} not found")
         
-        return user, user.kyc_status
+        return row.kyc_status
     
     @staticmethod
     async def log_invariant_violation(
@@ -196,19 +272,32 @@ class InvariantValidator:
             )
         """
         log.critical(
-            f"🚨 INVARIANT VIOLATION DETECTED 🚨\n"
-            f"  Violation Type: {violation_type}\n"
-            f"  User ID: {user_id}\n"
-            f"  Account ID: {account_id}\n"
-            f"  Details: {details}\n"
-            f"  Action: Operation blocked, audit recorded"
+            "🚨 INVARIANT VIOLATION DETECTED 🚨\n"
+            "  Violation Type: %s\n"
+            "  User ID: %s\n"
+            "  Account ID: %s\n"
+            "  Details: %s\n"
+            "  Action: Operation blocked, audit recorded",
+            violation_type, user_id, account_id, details
         )
 
 
+def invariant_cache() -> Dict[int, Tuple[DBUser, DBAccount]]:
+    """
+    FastAPI dependency providing a per-request cache for invariant lookups.
+    
+    FastAPI resolves a dependency once per request, so every consumer in the
+    same request shares the dict:
+        cache: dict = Depends(invariant_cache)
+    """
+    return {}
+
+
 async def ensure_operation_has_account(
     db: AsyncSession,
     user_id: int,
-    operation_name: str = "operation"
+    operation_name: str = "operation",
+    cache: Optional[Dict[int, Tuple[DBUser, DBAccount]]] = None
 ) -> DBAccount:
     """
     Shorthand wrapper for InvariantValidator.ensure_user_has_account()
@@ -225,10 +314,12 @@ async def ensure_operation_has_account(
             )
     """
     try:
-        return await InvariantValidator.ensure_user_has_account(
+        user, account = await InvariantValidator.ensure_user_has_account(
             db, user_id,
-            error_prefix=f"{operation_name} blocked"
+            error_prefix=f"{operation_name} blocked",
+            cache=cache
         )
+        return account
     except UserAccountInvariantError as e:
         await InvariantValidator.log_invariant_violation(
             user_id=user_id,
@@ -242,14 +333,14 @@ async def ensure_operation_has_account(
 async def validate_balance_calculation(
     db: AsyncSession,
     user_id: int
-) -> float:
+) -> Decimal:
     """
     Get authoritative user balance.
     
     RULE: Balance = sum of all completed transactions for user's account
     NEVER use stored account.balance - always recalculate
     
-    Returns: balance (float)
+    Returns: balance (Decimal)
     """
     user, account, balance = await InvariantValidator.validate_balance_query(db, user_id)
     return balance
@@ -259,7 +350,8 @@ async def validate_balance_calculation(
 async def check_user_account_invariant_middleware(
     user_id: int,
     db: AsyncSession,
-    endpoint_name: str = "endpoint"
+    endpoint_name: str = "endpoint",
+    cache: Optional[Dict[int, Tuple[DBUser, DBAccount]]] = None
 ) -> Dict[str, Any]:
     """
     Use in FastAPI endpoints to ensure invariants before operation.
@@ -269,11 +361,12 @@ async def check_user_account_invariant_middleware(
         async def sensitive_op(
             payload: Request,
             db: SessionDep,
-            current_user: CurrentUserDep
+            current_user: CurrentUserDep,
+            cache: dict = Depends(invariant_cache)
         ):
             # Check invariants first
             context = await check_user_account_invariant_middleware(
-                current_user.id, db, "sensitive_operation"
+                current_user.id, db, "sensitive_operation", cache=cache
             )
             
             if not context["valid"]:
@@ -284,9 +377,10 @@ async def check_user_account_invariant_middleware(
             ...
     """
     try:
-        account = await InvariantValidator.ensure_user_has_account(
+        user, account = await InvariantValidator.ensure_user_has_account(
             db, user_id,
-            error_prefix=endpoint_name
+            error_prefix=endpoint_name,
+            cache=cache
         )
         return {
             "valid": True,
@@ -17,7 +17,8 @@ Usage:
 
 import asyncio
 import logging
-from sqlalchemy import select, text
+from typing import Optional
+from sqlalchemy import select, text, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import SessionLocal
@@ -30,128 +31,210 @@ log = logging.getLogger(__name__)
 class InvariantChecker:
     """Check database for invariant violations"""
     
+    # Checks COUNT(*) the violations and, only when there are any, fetch a
+    # bounded sample (SAMPLE_LIMIT rows) of the reported columns for logging,
+    # so memory stays bounded however broken the database is.
+    SAMPLE_LIMIT = 100
+    
+    # Violation queries, parameterized by the selected columns so the same
+    # FROM/WHERE serves both the COUNT(*) and the sample. Orphans are found
+    # with LEFT JOIN ... WHERE target.id IS NULL, which planners turn into an
+    # anti-join on the foreign key index.
+    @staticmethod
+    def _orphaned_users_query(*columns):
+        return (
+            select(*columns)
+            .select_from(DBUser)
+            .outerjoin(DBAccount, DBAccount.owner_id == DBUser.id)
+            .where(DBAccount.id.is_(None))
+        )
+    
+    @staticmethod
+    def _orphaned_accounts_query(*columns):
+        return (
+            select(*columns)
+            .select_from(DBAccount)
+            .outerjoin(DBUser, DBUser.id == DBAccount.owner_id)
+            .where(DBUser.id.is_(None))  # Accounts with no owner
+        )
+    
+    @staticmethod
+    def _transactions_without_account_query(*columns):
+        return (
+            select(*columns)
+            .select_from(DBTransaction)
+            .where(
+                # account_id is NOT NULL in the model, so only the legacy 0
+                # "unassigned" sentinel can match today; the IS NULL branch is
+                # kept for databases created before the constraint
+                DBTransaction.account_id.is_(None) | (DBTransaction.account_id == 0)
+            )
+        )
+    
     @staticmethod
-    async def check_orphaned_users(db: AsyncSession):
+    def _users_without_kyc_query(*columns):
+        return (
+            select(*columns)
+            .select_from(DBUser)
+            .where((DBUser.kyc_status == None) | (DBUser.kyc_status == ''))
+        )
+    
+    @staticmethod
+    async def _count(db: AsyncSession, query, count: Optional[int]) -> int:
+        """Return count, running the query's COUNT(*) only when it is unknown"""
+        if count is None:
+            result = await db.execute(query(func.count()))
+            count = result.scalar_one()
+        return count
+    
+    @staticmethod
+    def _log_truncation(count: int, sample: list):
+        if count > len(sample):
+            log.critical("   ... and %s more", count - len(sample))
+    
+    @staticmethod
+    async def check_orphaned_users(db: AsyncSession, count: Optional[int] = None):
         """Find users without accounts"""
         log.info("🔍 Checking for orphaned users (users without accounts)...")
         
-        # Query: Users with no associated account
-        result = await db.execute(
-            select(DBUser).filter(
-                ~DBUser.accounts.any()  # SQLAlchemy relationship negation
-            )
-        )
-        orphaned = result.scalars().all()
-        
-        if orphaned:
-            log.critical(f"🚨 Found {len(orphaned)} orphaned users:")
-            for user in orphaned:
-                log.critical(
-                    f"   ❌ User ID {user.id}: {user.email} "
-                    f"(created: {user.created_at})"
-                )
-            return len(orphaned), orphaned
-        else:
+        query = InvariantChecker._orphaned_users_query
+        count = await InvariantChecker._count(db, query, count)
+        if not count:
             log.info("✅ No orphaned users found")
             return 0, []
+        
+        log.critical("🚨 Found %s orphaned users:", count)
+        result = await db.stream(
+            query(DBUser.id, DBUser.email, DBUser.created_at)
+            .limit(InvariantChecker.SAMPLE_LIMIT)
+        )
+        orphaned = []
+        async for user in result:
+            orphaned.append(user)
+            log.critical(
+                "   ❌ User ID %s: %s (created: %s)",
+                user.id, user.email, user.created_at
+            )
+        InvariantChecker._log_truncation(count, orphaned)
+        return count, orphaned
     
     @staticmethod
-    async def check_orphaned_accounts(db: AsyncSession):
+    async def check_orphaned_accounts(db: AsyncSession, count: Optional[int] = None):
         """Find accounts without users"""
         log.info("🔍 Checking for orphaned accounts (accounts without users)...")
         
-        result = await db.execute(
-            select(DBAccount).filter(
-                ~DBAccount.owner.any()  # Accounts with no owner
-            )
-        )
-        orphaned = result.scalars().all()
-        
-        if orphaned:
-            log.critical(f"🚨 Found {len(orphaned)} orphaned accounts:")
-            for account in orphaned:
-                log.critical(
-                    f"   ❌ Account ID {account.id}: {account.account_number} "
-                    f"(owner_id: {account.owner_id})"
-                )
-            return len(orphaned), orphaned
-        else:
+        query = InvariantChecker._orphaned_accounts_query
+        count = await InvariantChecker._count(db, query, count)
+        if not count:
             log.info("✅ No orphaned accounts found")
             return 0, []
+        
+        log.critical("🚨 Found %s orphaned accounts:", count)
+        result = await db.stream(
+            query(DBAccount.id, DBAccount.account_number, DBAccount.owner_id)
+            .limit(InvariantChecker.SAMPLE_LIMIT)
+        )
+        orphaned = []
+        async for account in result:
+            orphaned.append(account)
+            log.critical(
+                "   ❌ Account ID %s: %s (owner_id: %s)",
+                account.id, account.account_number, account.owner_id
+            )
+        InvariantChecker._log_truncation(count, orphaned)
+        return count, orphaned
     
     @staticmethod
-    async def check_transactions_without_account(db: AsyncSession):
+    async def check_transactions_without_account(db: AsyncSession, count: Optional[int] = None):
         """Find transactions without account_id"""
         log.info("🔍 Checking for transactions without account_id...")
         
-        result = await db.execute(
-            select(DBTransaction).filter(
-                (DBTransaction.account_id == None) |
-                (DBTransaction.account_id == 0)
-            )
-        )
-        invalid = result.scalars().all()
-        
-        if invalid:
-            log.critical(f"🚨 Found {len(invalid)} transactions without account_id:")
-            for tx in invalid:
-                log.critical(
-                    f"   ❌ Transaction ID {tx.id}: user_id={tx.user_id}, "
-                    f"account_id={tx.account_id}"
-                )
-            return len(invalid), invalid
-        else:
+        query = InvariantChecker._transactions_without_account_query
+        count = await InvariantChecker._count(db, query, count)
+        if not count:
             log.info("✅ No transactions without account_id found")
             return 0, []
+        
+        log.critical("🚨 Found %s transactions without account_id:", count)
+        result = await db.stream(
+            query(DBTransaction.id, DBTransaction.user_id, DBTransaction.account_id)
+            .limit(InvariantChecker.SAMPLE_LIMIT)
+        )
+        invalid = []
+        async for tx in result:
+            invalid.append(tx)
+            log.critical(
+                "   ❌ Transaction ID %s: user_id=%s, account_id=%s",
+                tx.id, tx.user_id, tx.account_id
+            )
+        InvariantChecker._log_truncation(count, invalid)
+        return count, invalid
     
     @staticmethod
-    async def check_users_without_kyc_status(db: AsyncSession):
+    async def check_users_without_kyc_status(db: AsyncSession, count: Optional[int] = None):
         """Find users without KYC status"""
         log.info("🔍 Checking for users without KYC status...")
         
-        result = await db.execute(
-            select(DBUser).filter(
-                (DBUser.kyc_status == None) | 
-                (DBUser.kyc_status == '')
-            )
-        )
-        invalid = result.scalars().all()
-        
-        if invalid:
-            log.critical(f"🚨 Found {len(invalid)} users without KYC status:")
-            for user in invalid:
-                log.critical(
-                    f"   ❌ User ID {user.id}: {user.email} "
-                    f"(kyc_status: '{user.kyc_status}')"
-                )
-            return len(invalid), invalid
-        else:
+        query = InvariantChecker._users_without_kyc_query
+        count = await InvariantChecker._count(db, query, count)
+        if not count:
             log.info("✅ All users have KYC status set")
             return 0, []
+        
+        log.critical("🚨 Found %s users without KYC status:", count)
+        result = await db.stream(
+            query(DBUser.id, DBUser.email, DBUser.kyc_status)
+            .limit(InvariantChecker.SAMPLE_LIMIT)
+        )
+        invalid = []
+        async for user in result:
+            invalid.append(user)
+            log.critical(
+                "   ❌ User ID %s: %s (kyc_status: '%s')",
+                user.id, user.email, user.kyc_status
+            )
+        InvariantChecker._log_truncation(count, invalid)
+        return count, invalid
     
     @staticmethod
     async def generate_report(db: AsyncSession):
-        """Generate comprehensive invariant violation report"""
+        """Generate comprehensive invariant violation report
+        
+        All four violation counts come back from one statement (a SELECT of
+        scalar COUNT subqueries); samples are then fetched only for the
+        checks that found something.
+        """
         log.info("\n" + "="*70)
         log.info("USER-ACCOUNT INVARIANT VERIFICATION REPORT")
         log.info("="*70 + "\n")
         
+        result = await db.execute(select(*(
+            query(func.count()).scalar_subquery()
+            for query in (
+                InvariantChecker._orphaned_users_query,
+                InvariantChecker._orphaned_accounts_query,
+                InvariantChecker._transactions_without_account_query,
+                InvariantChecker._users_without_kyc_query,
+            )
+        )))
+        counts = result.one()
+        
         violations = 0
         
         # Check 1: Orphaned users
-        orphaned_user_count, orphaned_users = await InvariantChecker.check_orphaned_users(db)
+        orphaned_user_count, orphaned_users = await InvariantChecker.check_orphaned_users(db, counts[0])
         violations += orphaned_user_count
         
         # Check 2: Orphaned accounts
-        orphaned_account_count, orphaned_accounts = await InvariantChecker.check_orphaned_accounts(db)
+        orphaned_account_count, orphaned_accounts = await InvariantChecker.check_orphaned_accounts(db, counts[1])
         violations += orphaned_account_count
         
         # Check 3: Transactions without account
-        invalid_tx_count, invalid_txs = await InvariantChecker.check_transactions_without_account(db)
+        invalid_tx_count, invalid_txs = await InvariantChecker.check_transactions_without_account(db, counts[2])
         violations += invalid_tx_count
         
         # Check 4: Users without KYC status
-        no_kyc_count, no_kyc_users = await InvariantChecker.check_users_without_kyc_status(db)
+        no_kyc_count, no_kyc_users = await InvariantChecker.check_users_without_kyc_status(db, counts[3])
         violations += no_kyc_count
         
         log.info("\n" + "="*70)
@@ -162,7 +245,7 @@ class InvariantChecker:
             log.info("   All transactions have account_id")
             log.info("   All users have KYC status")
         else:
-            log.critical(f"⚠️  FOUND {violations} INVARIANT VIOLATIONS!")
+            log.critical("⚠️  FOUND %s INVARIANT VIOLATIONS!", violations)
             log.critical("   The system has core integrity issues.")
             log.critical("   Please run fix_orphaned_users.py to resolve.")
         log.info("="*70 + "\n")
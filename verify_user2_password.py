@@ -4,45 +4,57 @@ Verify the exact password for Supremercyworld@gmail.com (ID 2)
 """
 
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select
-from config import settings
+from database import SessionLocal
 import models
 from auth_utils import verify_password
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 async def verify_user_password():
     """Verify password for user"""
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    try:
-        async with async_session() as db:
-            # Get user
-            result = await db.execute(
-                select(models.User).where(models.User.id == 2)
-            )
-            user = result.scalar_one_or_none()
-            
-            if user:
-                print(f"User ID 2")
-                print(f"Email: {user.email}")
-                print(f"Hash: {user.hashed_password}")
-                print()
-                
-                passwords_to_test = [
-                    "Supposedbe",
-                    "test123",
-                    "password",
-                    "DebugTest123!"
-                ]
-                
-                for pwd in passwords_to_test:
-                    result = verify_password(pwd, user.hashed_password)
-                    print(f"Password '{pwd}': {result}")
+    async with SessionLocal() as db:
+        # Get user
+        result = await db.execute(
+            select(models.User.email, models.User.hashed_password)
+            .where(models.User.id == 2)
+        )
+        user = result.one_or_none()
+
+        if user:
+            print(f"User ID 2")
+            print(f"Email: {user.email}")
+            print(f"Hash: {user.hashed_password}")
+            print()
 
-    finally:
-        await engine.dispose()
+            passwords_to_test = [
+                "Supposedbe",
+                "test123",
+                "password",
+                "DebugTest123!"
+            ]
+
+            # Hash checks are CPU-bound and release the GIL; run them in threads
+            async def check(pwd):
+                return pwd, await asyncio.to_thread(verify_password, pwd, user.hashed_password)
+
+            tasks = [asyncio.create_task(check(pwd)) for pwd in passwords_to_test]
+            try:
+                # Report in completion order and stop at the first match
+                for fut in asyncio.as_completed(tasks):
+                    pwd, result = await fut
+                    print(f"Password '{pwd}': {result}")
+                    if result:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
 
 if __name__ == "__main__":
-    asyncio.run(verify_user_password())
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(verify_user_password())
@@ -3,18 +3,55 @@ Webhook Service - Phase 3C
 Manages webhook registration, delivery, verification, and retry logic
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from time import time
+from typing import Optional, List, Dict, Any, Set
+from collections import defaultdict, deque
+from itertools import count
+from operator import attrgetter
 from sqlalchemy.orm import Session
 import logging
 import hashlib
 import hmac
-import json
 from enum import Enum
 import asyncio
+import heapq
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
 
 log = logging.getLogger(__name__)
 
+
+_last_ts = [0.0, ""]
+
+
+def _now_iso() -> str:
+    """Timezone-aware UTC ISO timestamp, memoized at 1ms granularity for bursts"""
+    t = time()
+    if t - _last_ts[0] > 0.001:
+        _last_ts[0] = t
+        _last_ts[1] = datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+    return _last_ts[1]
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize obj to canonical (key-sorted) JSON bytes for signing"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    # Match orjson's compact UTF-8 output so signatures don't depend on it
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
 # Webhook event types
 class WebhookEventType(str, Enum):
     REGION_CREATED = "region.created"
@@ -29,11 +66,209 @@ class WebhookEventType(str, Enum):
     API_ERROR = "api.error"
 
 
+@dataclass(slots=True)
+class Webhook:
+    """A registered webhook endpoint"""
+    id: str
+    url: str
+    events: frozenset
+    secret_bytes: bytes
+    max_retries: int
+    retry_delay_seconds: int
+    is_active: bool
+    created_at: str
+    last_triggered_at: Optional[str] = None
+    total_deliveries: int = 0
+    failed_deliveries: int = 0
+    # Keyed HMAC state; copy() per event instead of re-absorbing the key
+    hmac_template: "hmac.HMAC" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.hmac_template = hmac.new(self.secret_bytes, digestmod="sha256")
+
+    def sign(self, body: bytes) -> bytes:
+        """HMAC-SHA256 digest of body under this webhook's secret"""
+        h = self.hmac_template.copy()
+        h.update(body)
+        return h.digest()
+
+
+# Public fields of a Webhook, fetched in one C-level call per record
+_WEBHOOK_FIELDS = (
+    "id", "url", "events", "is_active", "created_at",
+    "last_triggered_at", "total_deliveries", "failed_deliveries"
+)
+_get_webhook_fields = attrgetter(*_WEBHOOK_FIELDS)
+
+
 # In-memory storage for webhooks (use database in production)
-WEBHOOKS_STORE = {}
-WEBHOOK_EVENTS_STORE = []
+WEBHOOKS_STORE: Dict[str, Webhook] = {}
+# Bounded: the oldest event records are evicted once the cap is reached
+WEBHOOK_EVENTS_MAX = 100_000
+WEBHOOK_EVENTS_STORE: deque = deque(maxlen=WEBHOOK_EVENTS_MAX)
 WEBHOOK_ID_COUNTER = 1000
 
+# Indexes over the stores so dispatch and retries touch only matching rows:
+# event type -> subscribed webhook ids, and delivery status -> {event id: record}
+WEBHOOKS_BY_EVENT: Dict[str, Set[str]] = defaultdict(set)
+EVENTS_BY_STATUS: Dict[str, Dict[str, dict]] = defaultdict(dict)
+_EVENT_IDS = count(1)
+
+# Running per-event-type tallies so status queries never scan the event store
+EVENT_STATUS_COUNTS: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {"total": 0, "delivered": 0, "failed": 0, "pending": 0}
+)
+
+# Pending queued events as a min-heap of (priority rank, queued_at, seq, record);
+# seq keeps ordering stable for equal priority and timestamp
+_PRIORITY_ORDER = {"high": 0, "normal": 1, "low": 2}
+_EVENT_HEAP: List[tuple] = []
+_EVENT_SEQ = count()
+
+
+# Deliveries share one keep-alive aiohttp session; the semaphore caps how many
+# POSTs are in flight at once across all triggered events
+_DELIVERY_CONCURRENCY = 64
+_DELIVERY_SEMAPHORE = asyncio.Semaphore(_DELIVERY_CONCURRENCY)
+_HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+_BACKGROUND_TASKS: Set[asyncio.Task] = set()
+
+
+def _is_public_address(host: str) -> bool:
+    """True if host is an IP address routable on the public internet"""
+    addr = ipaddress.ip_address(host.split("%", 1)[0])
+    return addr.is_global and not addr.is_multicast
+
+
+def _check_webhook_url(url: str) -> Optional[str]:
+    """Static URL checks; returns an error message or None if acceptable"""
+    try:
+        parts = urlsplit(url)
+        hostname = parts.hostname
+        parts.port
+    except ValueError:
+        return "Invalid webhook URL"
+    if parts.scheme != "https":
+        return "Webhook URL must use https"
+    if not hostname:
+        return "Webhook URL must include a host"
+    try:
+        if not _is_public_address(hostname):
+            return "Webhook URL must not target a private or reserved address"
+    except ValueError:
+        pass  # A hostname, not an IP literal; checked when resolved
+    return None
+
+
+async def validate_webhook_url(url: str) -> Optional[str]:
+    """Full URL check including DNS; returns an error message or None"""
+    error = _check_webhook_url(url)
+    if error:
+        return error
+    parts = urlsplit(url)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parts.hostname, parts.port or 443, type=socket.SOCK_STREAM
+        )
+    except OSError:
+        return "Webhook host could not be resolved"
+    if not all(_is_public_address(info[4][0]) for info in infos):
+        return "Webhook URL must not target a private or reserved address"
+    return None
+
+
+class _PublicOnlyResolver(AbstractResolver):
+    """Resolver that refuses hosts resolving to non-public addresses
+
+    Applied at connect time, so a host that re-resolves to an internal
+    address after registration (DNS rebinding) is still refused.
+    """
+
+    def __init__(self):
+        self._resolver = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        hosts = await self._resolver.resolve(host, port, family)
+        if not all(_is_public_address(h["host"]) for h in hosts):
+            raise OSError(f"Webhook host {host} resolves to a non-public address")
+        return hosts
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Return the shared delivery session, creating it on first use"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                resolver=_PublicOnlyResolver(),
+                limit=200,
+                limit_per_host=32,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                # Outlive the common 15s server-side keep-alive so retries and
+                # bursts reuse warm TCP/TLS connections
+                keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _HTTP_SESSION
+
+
+async def close_http_client() -> None:
+    """Close the shared delivery session (call on application shutdown)"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is not None:
+        await _HTTP_SESSION.close()
+        _HTTP_SESSION = None
+
+
+def _spawn(coro) -> None:
+    """Run coro in the background, holding a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+
+def _evict_event(event_record: Dict) -> None:
+    """Drop a record that fell off WEBHOOK_EVENTS_STORE from the indexes"""
+    event_record["_evicted"] = True
+    counts = EVENT_STATUS_COUNTS[event_record["event_type"]]
+    counts["total"] -= 1
+    status = event_record.get("delivery_status")
+    if status is not None:
+        EVENTS_BY_STATUS[status].pop(event_record["id"], None)
+        counts[status] -= 1
+
+
+def _record_event(event_record: Dict) -> None:
+    """Add a new record to the event store and its indexes"""
+    if len(WEBHOOK_EVENTS_STORE) == WEBHOOK_EVENTS_MAX:
+        _evict_event(WEBHOOK_EVENTS_STORE[0])
+    WEBHOOK_EVENTS_STORE.append(event_record)
+    counts = EVENT_STATUS_COUNTS[event_record["event_type"]]
+    counts["total"] += 1
+    status = event_record.get("delivery_status")
+    if status is not None:
+        EVENTS_BY_STATUS[status][event_record["id"]] = event_record
+        counts[status] += 1
+
+
+def _set_delivery_status(event_record: Dict, status: str) -> None:
+    """Move a delivery record to a new status, keeping the indexes in sync"""
+    previous = event_record["delivery_status"]
+    event_record["delivery_status"] = status
+    if event_record.get("_evicted"):
+        # Evicted while in flight; it no longer counts toward any index
+        return
+    EVENTS_BY_STATUS[previous].pop(event_record["id"], None)
+    EVENTS_BY_STATUS[status][event_record["id"]] = event_record
+    counts = EVENT_STATUS_COUNTS[event_record["event_type"]]
+    counts[previous] -= 1
+    counts[status] += 1
+
 
 class WebhookManager:
     """Manages webhook registration and lifecycle"""
@@ -51,28 +286,31 @@ class WebhookManager:
         try:
             global WEBHOOK_ID_COUNTER
             
+            url_error = await validate_webhook_url(webhook_url)
+            if url_error:
+                return {"success": False, "error": url_error}
+            
             # Generate webhook ID and secret
             webhook_id = f"wh_{WEBHOOK_ID_COUNTER}"
             WEBHOOK_ID_COUNTER += 1
             
             if not secret:
-                secret = hashlib.sha256(f"{webhook_url}{datetime.utcnow().isoformat()}".encode()).hexdigest()
-            
-            webhook_data = {
-                "id": webhook_id,
-                "url": webhook_url,
-                "events": events,
-                "secret": secret,
-                "max_retries": max_retries,
-                "retry_delay_seconds": retry_delay_seconds,
-                "is_active": True,
-                "created_at": datetime.utcnow().isoformat(),
-                "last_triggered_at": None,
-                "total_deliveries": 0,
-                "failed_deliveries": 0
-            }
+                secret = hashlib.sha256(f"{webhook_url}{datetime.now(timezone.utc).isoformat()}".encode()).hexdigest()
+            
+            webhook_data = Webhook(
+                id=webhook_id,
+                url=webhook_url,
+                events=frozenset(events),
+                secret_bytes=secret.encode(),
+                max_retries=max_retries,
+                retry_delay_seconds=retry_delay_seconds,
+                is_active=True,
+                created_at=_now_iso()
+            )
             
             WEBHOOKS_STORE[webhook_id] = webhook_data
+            for event in webhook_data.events:
+                WEBHOOKS_BY_EVENT[event].add(webhook_id)
             
             log.info(f"Webhook registered: {webhook_id} for events {events}")
             
@@ -81,7 +319,7 @@ class WebhookManager:
                 "data": {
                     "webhook_id": webhook_id,
                     "url": webhook_url,
-                    "events": events,
+                    "events": sorted(webhook_data.events),
                     "secret": secret,
                     "message": "Webhook registered successfully"
                 }
@@ -99,29 +337,35 @@ class WebhookManager:
         """Trigger webhooks for an event"""
         try:
             triggered_webhooks = []
-            
-            for webhook_id, webhook_data in WEBHOOKS_STORE.items():
-                # Check if webhook is active and subscribed to this event
-                if webhook_data["is_active"] and event_type in webhook_data["events"]:
+            deliveries = []
+            # Serialized once per event, shared by every subscriber and retry
+            payload_bytes = _dumps(payload)
+            
+            for webhook_id in WEBHOOKS_BY_EVENT.get(event_type, ()):
+                webhook_data = WEBHOOKS_STORE[webhook_id]
+                # Subscribers come from the index; only active ones are delivered
+                if webhook_data.is_active:
                     
                     # Create event record
                     event_record = {
+                        "id": f"evt_{next(_EVENT_IDS)}",
                         "webhook_id": webhook_id,
                         "event_type": event_type,
                         "payload": payload,
-                        "created_at": datetime.utcnow().isoformat(),
+                        "_payload_bytes": payload_bytes,
+                        "created_at": _now_iso(),
                         "delivery_attempts": 0,
                         "delivered_at": None,
                         "delivery_status": "pending"
                     }
                     
-                    WEBHOOK_EVENTS_STORE.append(event_record)
+                    _record_event(event_record)
                     triggered_webhooks.append(webhook_id)
-                    
-                    # Queue for async delivery
-                    asyncio.create_task(
-                        WebhookManager._deliver_webhook(webhook_id, webhook_data, event_record)
-                    )
+                    deliveries.append((webhook_id, webhook_data, event_record))
+            
+            # Deliver in the background as one bounded batch
+            if deliveries:
+                _spawn(WebhookManager._deliver_batch(deliveries))
             
             log.info(f"Webhook triggered for {event_type}: {len(triggered_webhooks)} webhooks queued")
             
@@ -131,7 +375,7 @@ class WebhookManager:
                     "event_type": event_type,
                     "triggered_webhooks": len(triggered_webhooks),
                     "webhook_ids": triggered_webhooks,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 }
             }
         except Exception as e:
@@ -139,39 +383,58 @@ class WebhookManager:
             return {"success": False, "error": str(e)}
     
     @staticmethod
-    async def _deliver_webhook(webhook_id: str, webhook_data: Dict, event_record: Dict) -> None:
+    async def _deliver_batch(deliveries: List[tuple]) -> None:
+        """Deliver (webhook_id, webhook_data, event_record) tuples concurrently"""
+        if len(deliveries) == 1:
+            # Single subscriber: skip the per-delivery Task that gather would create
+            await WebhookManager._deliver_webhook(*deliveries[0])
+            return
+        await asyncio.gather(
+            *(WebhookManager._deliver_webhook(*delivery) for delivery in deliveries),
+            return_exceptions=True
+        )
+    
+    @staticmethod
+    async def _deliver_webhook(webhook_id: str, webhook_data: Webhook, event_record: Dict) -> None:
         """Async webhook delivery with retry logic"""
         try:
-            max_retries = webhook_data["max_retries"]
-            retry_delay = webhook_data["retry_delay_seconds"]
+            max_retries = webhook_data.max_retries
+            retry_delay = webhook_data.retry_delay_seconds
+            
+            # Body, signature and headers are fixed for the event; build them once
+            body = event_record["_payload_bytes"]
+            headers = {
+                "Content-Type": "application/json",
+                "X-Webhook-Event": event_record["event_type"],
+                "X-Webhook-Signature": webhook_data.sign(body).hex()
+            }
             
             for attempt in range(max_retries):
-                try:
-                    # Simulate HTTP delivery (in production use actual HTTP client)
+                event_record["delivery_attempts"] += 1
+                
+                # Only the send holds a concurrency slot, not the retry wait
+                async with _DELIVERY_SEMAPHORE:
                     success = await WebhookManager._send_http_request(
-                        webhook_data["url"],
-                        event_record,
-                        webhook_data["secret"]
+                        webhook_data.url,
+                        body,
+                        headers
                     )
-                    
-                    if success:
-                        event_record["delivery_status"] = "delivered"
-                        event_record["delivered_at"] = datetime.utcnow().isoformat()
-                        webhook_data["total_deliveries"] += 1
-                        webhook_data["last_triggered_at"] = datetime.utcnow().isoformat()
-                        log.info(f"Webhook {webhook_id} delivered successfully")
-                        return
-                    
-                except Exception as e:
-                    log.warning(f"Webhook delivery attempt {attempt + 1} failed: {e}")
-                    event_record["delivery_attempts"] += 1
-                    
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(retry_delay)
+                
+                if success:
+                    _set_delivery_status(event_record, "delivered")
+                    event_record["delivered_at"] = _now_iso()
+                    webhook_data.total_deliveries += 1
+                    webhook_data.last_triggered_at = _now_iso()
+                    log.info(f"Webhook {webhook_id} delivered successfully")
+                    return
+                
+                log.warning(f"Webhook {webhook_id} delivery attempt {attempt + 1} failed")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
             
             # All retries exhausted
-            event_record["delivery_status"] = "failed"
-            webhook_data["failed_deliveries"] += 1
+            _set_delivery_status(event_record, "failed")
+            webhook_data.failed_deliveries += 1
             log.error(f"Webhook {webhook_id} delivery failed after {max_retries} attempts")
             
         except Exception as e:
@@ -180,33 +443,34 @@ class WebhookManager:
     @staticmethod
     async def _send_http_request(
         url: str,
-        event_record: Dict,
-        secret: str
+        body: bytes,
+        headers: Dict[str, str]
     ) -> bool:
         """Send HTTP POST request to webhook URL"""
+        # Host names are re-checked by the session's resolver at connect time
+        url_error = _check_webhook_url(url)
+        if url_error:
+            log.error(f"Refusing webhook delivery to {url}: {url_error}")
+            return False
         try:
-            # Simulate HTTP request (in production use aiohttp or httpx)
-            signature = WebhookManager._generate_signature(event_record, secret)
-            
-            # Simulate 95% success rate for demo
-            import random
-            success = random.random() < 0.95
-            
-            return success
+            # Redirects are not followed: they could point at internal hosts
+            async with _get_http_session().post(
+                url, data=body, headers=headers, allow_redirects=False
+            ) as response:
+                return 200 <= response.status < 300
         except Exception as e:
             log.error(f"Error sending HTTP request: {e}")
             return False
     
     @staticmethod
-    def _generate_signature(payload: Dict, secret: str) -> str:
+    def _signature_digest(payload: Dict, webhook_data: Webhook) -> bytes:
+        """Raw HMAC-SHA256 digest of the canonical payload"""
+        return webhook_data.sign(_dumps(payload))
+    
+    @staticmethod
+    def _generate_signature(payload: Dict, webhook_data: Webhook) -> str:
         """Generate HMAC signature for webhook"""
-        payload_str = json.dumps(payload, sort_keys=True)
-        signature = hmac.new(
-            secret.encode(),
-            payload_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        return WebhookManager._signature_digest(payload, webhook_data).hex()
     
     @staticmethod
     async def verify_webhook_signature(
@@ -221,17 +485,20 @@ class WebhookManager:
                 return {"success": False, "error": "Webhook not found"}
             
             webhook_data = WEBHOOKS_STORE[webhook_id]
-            secret = webhook_data["secret"]
             
-            expected_signature = WebhookManager._generate_signature(payload, secret)
+            expected = WebhookManager._signature_digest(payload, webhook_data)
+            try:
+                provided = bytes.fromhex(signature)
+            except ValueError:
+                provided = b""
             
-            if hmac.compare_digest(signature, expected_signature):
+            if hmac.compare_digest(provided, expected):
                 return {
                     "success": True,
                     "data": {
                         "verified": True,
                         "webhook_id": webhook_id,
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": _now_iso()
                     }
                 }
             else:
@@ -248,12 +515,10 @@ class WebhookManager:
     async def retry_failed_webhooks(db: Session) -> dict:
         """Retry delivery of failed webhook events"""
         try:
-            failed_events = [
-                e for e in WEBHOOK_EVENTS_STORE
-                if e["delivery_status"] == "failed"
-            ]
+            failed_events = list(EVENTS_BY_STATUS["failed"].values())
             
             retried_count = 0
+            deliveries = []
             for event in failed_events:
                 webhook_id = event["webhook_id"]
                 if webhook_id in WEBHOOKS_STORE:
@@ -261,49 +526,44 @@ class WebhookManager:
                     
                     # Reset and retry
                     event["delivery_attempts"] = 0
-                    event["delivery_status"] = "pending"
+                    _set_delivery_status(event, "pending")
                     
-                    asyncio.create_task(
-                        WebhookManager._deliver_webhook(webhook_id, webhook_data, event)
-                    )
+                    deliveries.append((webhook_id, webhook_data, event))
                     retried_count += 1
             
+            if deliveries:
+                _spawn(WebhookManager._deliver_batch(deliveries))
+            
             log.info(f"Retried {retried_count} failed webhook deliveries")
             
             return {
                 "success": True,
                 "data": {
                     "retried_count": retried_count,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 }
             }
         except Exception as e:
             log.error(f"Error retrying failed webhooks: {e}")
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def iter_webhooks():
+        """Yield each registered webhook as a public dict, one at a time"""
+        for wh in WEBHOOKS_STORE.values():
+            row = dict(zip(_WEBHOOK_FIELDS, _get_webhook_fields(wh)))
+            row["events"] = sorted(row["events"])
+            yield row
+    
     @staticmethod
     async def list_webhooks(db: Session) -> dict:
         """List all registered webhooks"""
         try:
-            webhooks = [
-                {
-                    "id": wh["id"],
-                    "url": wh["url"],
-                    "events": wh["events"],
-                    "is_active": wh["is_active"],
-                    "created_at": wh["created_at"],
-                    "last_triggered_at": wh["last_triggered_at"],
-                    "total_deliveries": wh["total_deliveries"],
-                    "failed_deliveries": wh["failed_deliveries"]
-                }
-                for wh in WEBHOOKS_STORE.values()
-            ]
-            
             return {
                 "success": True,
                 "data": {
-                    "count": len(webhooks),
-                    "webhooks": webhooks
+                    "count": len(WEBHOOKS_STORE),
+                    "webhooks": list(WebhookManager.iter_webhooks())
                 }
             }
         except Exception as e:
@@ -318,6 +578,12 @@ class WebhookManager:
                 return {"success": False, "error": "Webhook not found"}
             
             webhook_data = WEBHOOKS_STORE.pop(webhook_id)
+            for event in webhook_data.events:
+                subscribers = WEBHOOKS_BY_EVENT.get(event)
+                if subscribers is not None:
+                    subscribers.discard(webhook_id)
+                    if not subscribers:
+                        del WEBHOOKS_BY_EVENT[event]
             
             log.info(f"Webhook deleted: {webhook_id}")
             
@@ -349,12 +615,18 @@ class WebhookEventQueue:
                 "event_type": event_type,
                 "payload": payload,
                 "priority": priority,
-                "queued_at": datetime.utcnow().isoformat(),
+                "queued_at": _now_iso(),
                 "processed": False,
                 "processed_at": None
             }
             
-            WEBHOOK_EVENTS_STORE.append(event_record)
+            _record_event(event_record)
+            heapq.heappush(_EVENT_HEAP, (
+                _PRIORITY_ORDER.get(priority, 1),
+                event_record["queued_at"],
+                next(_EVENT_SEQ),
+                event_record
+            ))
             
             log.info(f"Event queued: {event_type} with priority {priority}")
             
@@ -374,23 +646,15 @@ class WebhookEventQueue:
     async def process_queue(db: Session, batch_size: int = 10) -> dict:
         """Process webhook event queue in batches"""
         try:
-            # Sort by priority (high first) and timestamp
-            priority_order = {"high": 0, "normal": 1, "low": 2}
-            
-            unprocessed_events = [
-                e for e in WEBHOOK_EVENTS_STORE
-                if not e.get("processed", True)
+            # Pop up to batch_size events, highest priority then oldest first
+            batch = [
+                heapq.heappop(_EVENT_HEAP)
+                for _ in range(min(batch_size, len(_EVENT_HEAP)))
             ]
             
-            unprocessed_events.sort(
-                key=lambda x: (
-                    priority_order.get(x.get("priority", "normal"), 1),
-                    x.get("queued_at", "")
-                )
-            )
-            
             processed_count = 0
-            for event in unprocessed_events[:batch_size]:
+            for entry in batch:
+                event = entry[3]
                 # Trigger webhooks for this event
                 result = await WebhookManager.trigger_webhook(
                     db,
@@ -400,8 +664,11 @@ class WebhookEventQueue:
                 
                 if result["success"]:
                     event["processed"] = True
-                    event["processed_at"] = datetime.utcnow().isoformat()
+                    event["processed_at"] = _now_iso()
                     processed_count += 1
+                else:
+                    # Leave it queued for the next batch
+                    heapq.heappush(_EVENT_HEAP, entry)
             
             log.info(f"Processed {processed_count} webhook events from queue")
             
@@ -409,8 +676,8 @@ class WebhookEventQueue:
                 "success": True,
                 "data": {
                     "processed_count": processed_count,
-                    "remaining_in_queue": len(unprocessed_events) - processed_count,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "remaining_in_queue": len(_EVENT_HEAP),
+                    "timestamp": _now_iso()
                 }
             }
         except Exception as e:
@@ -421,16 +688,15 @@ class WebhookEventQueue:
     async def get_event_status(db: Session, event_type: str) -> dict:
         """Get delivery status of events"""
         try:
-            events = [
-                e for e in WEBHOOK_EVENTS_STORE
-                if e.get("event_type") == event_type
-            ]
+            counts = EVENT_STATUS_COUNTS.get(event_type)
+            if counts is None:
+                counts = {"total": 0, "delivered": 0, "failed": 0, "pending": 0}
             
             status_summary = {
-                "total_events": len(events),
-                "delivered": sum(1 for e in events if e.get("delivery_status") == "delivered"),
-                "failed": sum(1 for e in events if e.get("delivery_status") == "failed"),
-                "pending": sum(1 for e in events if e.get("delivery_status") == "pending")
+                "total_events": counts["total"],
+                "delivered": counts["delivered"],
+                "failed": counts["failed"],
+                "pending": counts["pending"]
             }
             
             status_summary["success_rate"] = round(
@@ -443,7 +709,7 @@ class WebhookEventQueue:
                 "data": {
                     "event_type": event_type,
                     "status": status_summary,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 }
             }
         except Exception as e: